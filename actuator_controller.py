@@ -5,15 +5,20 @@ Modern UI with CustomTkinter
 """
 
 import customtkinter as ctk
+import collections
+import mmap
 import threading
 import time
 import os
-from datetime import datetime
+from functools import partial
 from tkinter import filedialog, messagebox
 import tkinter as tk
 
 from settings_manager import SettingsManager
-from bluetooth_manager import BluetoothManager, CommandProtocol, parse_response
+from bluetooth_manager import (BluetoothManager, CommandProtocol, parse_response,
+                               EXTEND_COMMANDS, RETRACT_COMMANDS,
+                               DWELL_EXTEND_COMMANDS, DWELL_RETRACT_COMMANDS,
+                               SPEED_COMMANDS, TYPE_COMMANDS)
 
 # Set appearance
 ctk.set_appearance_mode("dark")
@@ -23,12 +28,34 @@ ctk.set_default_color_theme("blue")
 class ActuatorControllerApp:
     """Main application class"""
 
+    # Terminal keeps only the most recent lines
+    SERIAL_MAX_LINES = 2000
+
+    # Keys that still work in the read-only terminal
+    TERMINAL_NAV_KEYS = ("Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next")
+
+    # Quiet time (ms) before a speed slider drag's final value is applied
+    SPEED_DEBOUNCE_MS = 80
+
+    # OTA streaming: chunk size, bytes allowed ahead of the device's last
+    # OTA_PROGRESS report, and how long to wait for a report once that is reached
+    OTA_CHUNK_SIZE = 4096
+    OTA_WINDOW_BYTES = 16384
+    OTA_ACK_WAIT = 0.1
+
+    # Minimum interval / byte step between OTA progress redraws
+    OTA_UI_INTERVAL = 0.1
+    OTA_UI_BYTES = 64 * 1024
+
     def __init__(self):
         self.root = ctk.CTk()
+        self.root.withdraw()  # Stay hidden until the layout is built
         self.root.title("Actuator Controller")
         self.root.geometry("680x750")
         self.root.minsize(650, 700)
-        self.root.state('zoomed')  # Start maximized
+
+        # Shared fonts, keyed by (family, size, weight, slant)
+        self._fonts = {}
 
         # Initialize managers
         self.settings = SettingsManager()
@@ -47,35 +74,91 @@ class ActuatorControllerApp:
 
         # Serial terminal state
         self.auto_scroll = ctk.BooleanVar(value=True)
+        self._serial_line_count = 0
+        self._serial_pending = []
+        self._last_ts_sec = -1
+        self._last_ts_str = ""
+
+        # Lines from the reader thread, drained on the Tk thread once per frame
+        self._rx_buffer = collections.deque()
+
+        # Coalesced slider sends (key -> latest command)
+        self._last_slider_values = {}
+        self._pending_sends = {}
+        self._flush_scheduled = False
+
+        # Debounced slider work (key -> (after id, fn, args))
+        self._debounce_jobs = {}
 
         # Settings tab state
         self.devices = []
+        self.settings_status_var = ctk.StringVar(value="Not connected")
+        self.connect_btn = None
+        self._connecting = False  # One connect attempt at a time (manual or auto)
 
         # Firmware/OTA state
         self.ota_file_path = None
         self.ota_in_progress = False
         self.ota_abort_flag = threading.Event()
         self.ota_ready_event = threading.Event()
+        self.ota_ack_event = threading.Event()
+        self.ota_complete_event = threading.Event()
+        self.ota_total_bytes = 0
+        self.ota_acked_bytes = 0
         self.ota_error_message = None
+        self.firmware_path_var = ctk.StringVar(value="No file selected")
+        self.firmware_info_var = ctk.StringVar(value="")
+        self.ota_progress_var = ctk.DoubleVar(value=0)
+        self.ota_status_var = ctk.StringVar(value="Ready")
+        self.device_version_var = ctk.StringVar(value="Unknown")
+
+        # Response handlers, keyed by response type
+        self._resp_handlers = {
+            "PONG": self._h_pong,
+            "STATUS": self._h_status,
+            "PROGRESS": self._h_progress,
+            "COMPLETE": self._h_complete,
+            "OK": self._h_ok,
+            "OTA_DONE": self._h_ota_done,
+            "REBOOT": self._h_ota_done,
+            "VERSION": self._h_version,
+            "OTA_PROGRESS": self._h_ota_progress,
+            "ERR": self._h_err,
+        }
 
         # Create UI
         self._create_widgets()
         self._load_settings_to_ui()
+        self.root.after(50, self._drain_rx)
+
+        # Show maximized once the layout is final
+        self.root.state('zoomed')
+        self.root.deiconify()
 
-        # Try to auto-connect to last device
-        self._auto_connect()
+        # Try to auto-connect to last device once the window has painted
+        self.root.after(200, self._auto_connect)
 
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
+    def _font(self, size, weight="normal", slant="roman", family=""):
+        """Return a shared CTkFont for the given style"""
+        key = (family, size, weight, slant)
+        font = self._fonts.get(key)
+        if font is None:
+            font = ctk.CTkFont(family=family, size=size, weight=weight, slant=slant)
+            self._fonts[key] = font
+        return font
+
     def _create_widgets(self):
         """Create all UI widgets"""
         # Create tabview
-        self.tabview = ctk.CTkTabview(self.root, width=660, height=700)
+        self.tabview = ctk.CTkTabview(self.root, width=660, height=700,
+                                      command=self._on_tab_changed)
         self.tabview.pack(padx=10, pady=10, fill="both", expand=True)
 
         # Make tab buttons 2x larger for touch
-        self.tabview._segmented_button.configure(height=64, font=("", 26))
+        self.tabview._segmented_button.configure(height=64, font=self._font(26))
 
         # Add tabs
         self.tab_control = self.tabview.add("Control")
@@ -83,11 +166,21 @@ class ActuatorControllerApp:
         self.tab_settings = self.tabview.add("Settings")
         self.tab_firmware = self.tabview.add("Firmware")
 
-        # Build tabs
+        # Build the visible tab now, the others on first view
         self._create_control_tab()
-        self._create_terminal_tab()
-        self._create_settings_tab()
-        self._create_firmware_tab()
+        self._tabs_built = {"Control"}
+        self._tab_builders = {
+            "Terminal": self._create_terminal_tab,
+            "Settings": self._create_settings_tab,
+            "Firmware": self._create_firmware_tab,
+        }
+
+    def _on_tab_changed(self):
+        """Build a tab the first time it is shown"""
+        name = self.tabview.get()
+        if name not in self._tabs_built:
+            self._tabs_built.add(name)
+            self._tab_builders[name]()
 
     def _create_control_tab(self):
         """Create the main control tab - compact layout with sliders"""
@@ -101,27 +194,27 @@ class ActuatorControllerApp:
         type_frame = ctk.CTkFrame(row1)
         type_frame.pack(side="left", padx=(0, 10))
 
-        ctk.CTkLabel(type_frame, text="Type:", font=("", 13)).pack(side="left", padx=10)
+        ctk.CTkLabel(type_frame, text="Type:", font=self._font(13)).pack(side="left", padx=10)
 
         self.actuator_type_var = ctk.IntVar(value=6700)
         self.type_6700_btn = ctk.CTkButton(type_frame, text="6700", width=70, height=36,
-                                            command=lambda: self._set_actuator_type(6700))
+                                            command=partial(self._set_actuator_type, 6700))
         self.type_6700_btn.pack(side="left", padx=2, pady=8)
 
         self.type_6600_btn = ctk.CTkButton(type_frame, text="6600", width=70, height=36,
                                             fg_color="gray40", hover_color="gray50",
-                                            command=lambda: self._set_actuator_type(6600))
+                                            command=partial(self._set_actuator_type, 6600))
         self.type_6600_btn.pack(side="left", padx=2, pady=8)
 
         # Connection status
         conn_frame = ctk.CTkFrame(row1)
         conn_frame.pack(side="right")
 
-        self.conn_indicator = ctk.CTkLabel(conn_frame, text="●", font=("", 20),
+        self.conn_indicator = ctk.CTkLabel(conn_frame, text="●", font=self._font(20),
                                             text_color="#AA0000")
         self.conn_indicator.pack(side="left", padx=10)
 
-        self.conn_label = ctk.CTkLabel(conn_frame, text="Disconnected", font=("", 13))
+        self.conn_label = ctk.CTkLabel(conn_frame, text="Disconnected", font=self._font(13))
         self.conn_label.pack(side="left", padx=(0, 10), pady=8)
 
         # === Row 2: Position + Timing Controls (side by side) ===
@@ -132,73 +225,71 @@ class ActuatorControllerApp:
         pos_frame = ctk.CTkFrame(row2)
         pos_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
 
-        ctk.CTkLabel(pos_frame, text="Position (degrees)", font=("", 13, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(pos_frame, text="Position (degrees)", font=self._font(13, "bold")).grid(
+            row=0, column=0, columnspan=5, sticky="w", padx=10, pady=(10, 5))
 
         # Extend slider with +/- buttons
-        ext_row = ctk.CTkFrame(pos_frame, fg_color="transparent")
-        ext_row.pack(fill="x", padx=10, pady=5)
-        ctk.CTkLabel(ext_row, text="Extend", font=("", 12), width=55).pack(side="left")
-        ctk.CTkButton(ext_row, text="-", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_extend(-1)).pack(side="left", padx=2)
-        self.extend_slider = ctk.CTkSlider(ext_row, from_=0, to=90, width=200, height=35,
+        ctk.CTkLabel(pos_frame, text="Extend", font=self._font(12), width=55).grid(row=1, column=0, padx=(10, 0), pady=5)
+        ctk.CTkButton(pos_frame, text="-", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_extend, -1)).grid(row=1, column=1, padx=2, pady=5)
+        self.extend_slider = ctk.CTkSlider(pos_frame, from_=0, to=90, width=200, height=35,
                                             command=self._on_extend_changed)
-        self.extend_slider.pack(side="left", padx=5)
+        self.extend_slider.grid(row=1, column=2, padx=5, pady=5)
         self.extend_slider.set(0)
-        ctk.CTkButton(ext_row, text="+", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_extend(1)).pack(side="left", padx=2)
-        self.extend_label = ctk.CTkLabel(ext_row, text="0°", font=("", 14, "bold"), width=45)
-        self.extend_label.pack(side="left", padx=5)
+        ctk.CTkButton(pos_frame, text="+", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_extend, 1)).grid(row=1, column=3, padx=2, pady=5)
+        self.extend_text = ctk.StringVar(value="0°")
+        self.extend_label = ctk.CTkLabel(pos_frame, textvariable=self.extend_text, font=self._font(14, "bold"), width=45)
+        self.extend_label.grid(row=1, column=4, padx=(5, 10), pady=5)
 
         # Retract slider with +/- buttons
-        ret_row = ctk.CTkFrame(pos_frame, fg_color="transparent")
-        ret_row.pack(fill="x", padx=10, pady=(0, 10))
-        ctk.CTkLabel(ret_row, text="Retract", font=("", 12), width=55).pack(side="left")
-        ctk.CTkButton(ret_row, text="-", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_retract(-1)).pack(side="left", padx=2)
-        self.retract_slider = ctk.CTkSlider(ret_row, from_=0, to=90, width=200, height=35,
+        ctk.CTkLabel(pos_frame, text="Retract", font=self._font(12), width=55).grid(row=2, column=0, padx=(10, 0), pady=(0, 10))
+        ctk.CTkButton(pos_frame, text="-", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_retract, -1)).grid(row=2, column=1, padx=2, pady=(0, 10))
+        self.retract_slider = ctk.CTkSlider(pos_frame, from_=0, to=90, width=200, height=35,
                                              command=self._on_retract_changed)
-        self.retract_slider.pack(side="left", padx=5)
+        self.retract_slider.grid(row=2, column=2, padx=5, pady=(0, 10))
         self.retract_slider.set(0)
-        ctk.CTkButton(ret_row, text="+", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_retract(1)).pack(side="left", padx=2)
-        self.retract_label = ctk.CTkLabel(ret_row, text="0°", font=("", 14, "bold"), width=45)
-        self.retract_label.pack(side="left", padx=5)
+        ctk.CTkButton(pos_frame, text="+", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_retract, 1)).grid(row=2, column=3, padx=2, pady=(0, 10))
+        self.retract_text = ctk.StringVar(value="0°")
+        self.retract_label = ctk.CTkLabel(pos_frame, textvariable=self.retract_text, font=self._font(14, "bold"), width=45)
+        self.retract_label.grid(row=2, column=4, padx=(5, 10), pady=(0, 10))
 
         # Right side - Timing (seconds)
         time_frame = ctk.CTkFrame(row2)
         time_frame.pack(side="right", fill="both", expand=True, padx=(5, 0))
 
-        ctk.CTkLabel(time_frame, text="Dwell Time (seconds)", font=("", 13, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(time_frame, text="Dwell Time (seconds)", font=self._font(13, "bold")).grid(
+            row=0, column=0, columnspan=5, sticky="w", padx=10, pady=(10, 5))
 
         # Dwell Extend slider with +/- buttons
-        dwell_ext_row = ctk.CTkFrame(time_frame, fg_color="transparent")
-        dwell_ext_row.pack(fill="x", padx=10, pady=5)
-        ctk.CTkLabel(dwell_ext_row, text="Extend", font=("", 12), width=55).pack(side="left")
-        ctk.CTkButton(dwell_ext_row, text="-", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_dwell_extend(-0.1)).pack(side="left", padx=2)
-        self.dwell_extend_slider = ctk.CTkSlider(dwell_ext_row, from_=0.1, to=3.5, width=200, height=35,
+        ctk.CTkLabel(time_frame, text="Extend", font=self._font(12), width=55).grid(row=1, column=0, padx=(10, 0), pady=5)
+        ctk.CTkButton(time_frame, text="-", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_dwell_extend, -0.1)).grid(row=1, column=1, padx=2, pady=5)
+        self.dwell_extend_slider = ctk.CTkSlider(time_frame, from_=0.1, to=3.5, width=200, height=35,
                                                   command=self._on_dwell_extend_changed)
-        self.dwell_extend_slider.pack(side="left", padx=5)
+        self.dwell_extend_slider.grid(row=1, column=2, padx=5, pady=5)
         self.dwell_extend_slider.set(2.0)
-        ctk.CTkButton(dwell_ext_row, text="+", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_dwell_extend(0.1)).pack(side="left", padx=2)
-        self.dwell_extend_label = ctk.CTkLabel(dwell_ext_row, text="2.0s", font=("", 14, "bold"), width=45)
-        self.dwell_extend_label.pack(side="left", padx=5)
+        ctk.CTkButton(time_frame, text="+", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_dwell_extend, 0.1)).grid(row=1, column=3, padx=2, pady=5)
+        self.dwell_extend_text = ctk.StringVar(value="2.0s")
+        self.dwell_extend_label = ctk.CTkLabel(time_frame, textvariable=self.dwell_extend_text, font=self._font(14, "bold"), width=45)
+        self.dwell_extend_label.grid(row=1, column=4, padx=(5, 10), pady=5)
 
         # Dwell Retract slider with +/- buttons
-        dwell_ret_row = ctk.CTkFrame(time_frame, fg_color="transparent")
-        dwell_ret_row.pack(fill="x", padx=10, pady=(0, 10))
-        ctk.CTkLabel(dwell_ret_row, text="Retract", font=("", 12), width=55).pack(side="left")
-        ctk.CTkButton(dwell_ret_row, text="-", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_dwell_retract(-0.1)).pack(side="left", padx=2)
-        self.dwell_retract_slider = ctk.CTkSlider(dwell_ret_row, from_=0.1, to=3.5, width=200, height=35,
+        ctk.CTkLabel(time_frame, text="Retract", font=self._font(12), width=55).grid(row=2, column=0, padx=(10, 0), pady=(0, 10))
+        ctk.CTkButton(time_frame, text="-", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_dwell_retract, -0.1)).grid(row=2, column=1, padx=2, pady=(0, 10))
+        self.dwell_retract_slider = ctk.CTkSlider(time_frame, from_=0.1, to=3.5, width=200, height=35,
                                                    command=self._on_dwell_retract_changed)
-        self.dwell_retract_slider.pack(side="left", padx=5)
+        self.dwell_retract_slider.grid(row=2, column=2, padx=5, pady=(0, 10))
         self.dwell_retract_slider.set(2.0)
-        ctk.CTkButton(dwell_ret_row, text="+", width=50, height=45, font=("", 18),
-                      command=lambda: self._adjust_dwell_retract(0.1)).pack(side="left", padx=2)
-        self.dwell_retract_label = ctk.CTkLabel(dwell_ret_row, text="2.0s", font=("", 14, "bold"), width=45)
-        self.dwell_retract_label.pack(side="left", padx=5)
+        ctk.CTkButton(time_frame, text="+", width=50, height=45, font=self._font(18),
+                      command=partial(self._adjust_dwell_retract, 0.1)).grid(row=2, column=3, padx=2, pady=(0, 10))
+        self.dwell_retract_text = ctk.StringVar(value="2.0s")
+        self.dwell_retract_label = ctk.CTkLabel(time_frame, textvariable=self.dwell_retract_text, font=self._font(14, "bold"), width=45)
+        self.dwell_retract_label.grid(row=2, column=4, padx=(5, 10), pady=(0, 10))
 
         # === Row 3: Speed + Cycles ===
         row3 = ctk.CTkFrame(tab, fg_color="transparent")
@@ -208,31 +299,32 @@ class ActuatorControllerApp:
         speed_frame = ctk.CTkFrame(row3)
         speed_frame.pack(side="left", expand=True, fill="x", padx=(0, 5))
 
-        ctk.CTkLabel(speed_frame, text="Speed", font=("", 13)).pack(side="left", padx=10)
+        ctk.CTkLabel(speed_frame, text="Speed", font=self._font(13)).pack(side="left", padx=10)
         self.speed_var = ctk.IntVar(value=100)
         self.speed_slider = ctk.CTkSlider(speed_frame, from_=1, to=100,
                                            variable=self.speed_var, width=150,
                                            command=self._on_speed_changed)
         self.speed_slider.pack(side="left", padx=5, pady=12)
-        self.speed_label = ctk.CTkLabel(speed_frame, text="100%", font=("", 13), width=45)
+        self.speed_text = ctk.StringVar(value="100%")
+        self.speed_label = ctk.CTkLabel(speed_frame, textvariable=self.speed_text, font=self._font(13), width=45)
         self.speed_label.pack(side="left", padx=5)
 
         # Cycles
         cycle_frame = ctk.CTkFrame(row3)
         cycle_frame.pack(side="right", padx=(5, 0))
 
-        ctk.CTkLabel(cycle_frame, text="Cycles:", font=("", 13)).pack(side="left", padx=(10, 5))
+        ctk.CTkLabel(cycle_frame, text="Cycles:", font=self._font(13)).pack(side="left", padx=(10, 5))
 
         ctk.CTkButton(cycle_frame, text="-", width=35, height=32,
-                      command=lambda: self._adjust_cycles(-10)).pack(side="left", padx=2)
+                      command=partial(self._adjust_cycles, -10)).pack(side="left", padx=2)
 
         self.cycles_var = ctk.IntVar(value=50)
         self.cycles_label = ctk.CTkLabel(cycle_frame, textvariable=self.cycles_var,
-                                          font=("", 16, "bold"), width=60)
+                                          font=self._font(16, "bold"), width=60)
         self.cycles_label.pack(side="left", padx=5)
 
         ctk.CTkButton(cycle_frame, text="+", width=35, height=32,
-                      command=lambda: self._adjust_cycles(10)).pack(side="left", padx=2)
+                      command=partial(self._adjust_cycles, 10)).pack(side="left", padx=2)
 
         ctk.CTkCheckBox(cycle_frame, text="∞", variable=self.infinite_cycles,
                         width=40, command=self._on_infinite_changed).pack(side="left", padx=(10, 10), pady=8)
@@ -247,92 +339,136 @@ class ActuatorControllerApp:
         self.progress_bar.pack(fill="x", pady=(5, 0))
         self.progress_bar.set(0)
 
-        self.progress_label = ctk.CTkLabel(row4, text="0 / 50 cycles", font=("", 12))
+        self.progress_label = ctk.CTkLabel(row4, text="0 / 50 cycles", font=self._font(12))
         self.progress_label.pack(pady=(5, 0))
 
-        # === Row 5: Main Control Buttons ===
-        row5 = ctk.CTkFrame(tab, fg_color="transparent")
-        row5.pack(fill="x", padx=10, pady=10)
+        # === Rows 5-6: Main Control + Override Buttons (one grid) ===
+        btn_grid = ctk.CTkFrame(tab, fg_color="transparent")
+        btn_grid.pack(padx=10, pady=10)
 
-        btn_frame = ctk.CTkFrame(row5, fg_color="transparent")
-        btn_frame.pack(expand=True)
-
-        self.start_btn = ctk.CTkButton(btn_frame, text="▶ START", width=130, height=50,
-                                        font=("", 16, "bold"), fg_color="#1f9e4a",
+        self.start_btn = ctk.CTkButton(btn_grid, text="▶ START", width=130, height=50,
+                                        font=self._font(16, "bold"), fg_color="#1f9e4a",
                                         hover_color="#178a3e", command=self._start_cycles)
-        self.start_btn.pack(side="left", padx=5)
+        self.start_btn.grid(row=0, column=0, padx=5, pady=(0, 10))
 
-        self.pause_btn = ctk.CTkButton(btn_frame, text="⏸ PAUSE", width=130, height=50,
-                                        font=("", 16, "bold"), fg_color="#d97706",
+        self.pause_btn = ctk.CTkButton(btn_grid, text="⏸ PAUSE", width=130, height=50,
+                                        font=self._font(16, "bold"), fg_color="#d97706",
                                         hover_color="#b45309", command=self._pause_cycles,
                                         state="disabled")
-        self.pause_btn.pack(side="left", padx=5)
+        self.pause_btn.grid(row=0, column=1, padx=5, pady=(0, 10))
 
-        self.stop_btn = ctk.CTkButton(btn_frame, text="⏹ STOP", width=130, height=50,
-                                       font=("", 16, "bold"), fg_color="#dc2626",
+        self.stop_btn = ctk.CTkButton(btn_grid, text="⏹ STOP", width=130, height=50,
+                                       font=self._font(16, "bold"), fg_color="#dc2626",
                                        hover_color="#b91c1c", command=self._stop_cycles,
                                        state="disabled")
-        self.stop_btn.pack(side="left", padx=5)
-
-        # === Row 6: Override Buttons ===
-        row6 = ctk.CTkFrame(tab, fg_color="transparent")
-        row6.pack(fill="x", padx=10, pady=(0, 10))
-
-        override_frame = ctk.CTkFrame(row6, fg_color="transparent")
-        override_frame.pack(expand=True)
+        self.stop_btn.grid(row=0, column=2, padx=5, pady=(0, 10))
 
-        self.home_btn = ctk.CTkButton(override_frame, text="HOME", width=100, height=36,
+        self.home_btn = ctk.CTkButton(btn_grid, text="HOME", width=100, height=36,
                                        fg_color="gray40", hover_color="gray50",
                                        command=self._go_home)
-        self.home_btn.pack(side="left", padx=5)
+        self.home_btn.grid(row=1, column=0, padx=5)
 
-        self.extend_btn = ctk.CTkButton(override_frame, text="EXTEND", width=100, height=36,
+        self.extend_btn = ctk.CTkButton(btn_grid, text="EXTEND", width=100, height=36,
                                          fg_color="gray40", hover_color="gray50",
                                          command=self._go_extend)
-        self.extend_btn.pack(side="left", padx=5)
+        self.extend_btn.grid(row=1, column=1, padx=5)
 
-        self.retract_btn = ctk.CTkButton(override_frame, text="RETRACT", width=100, height=36,
+        self.retract_btn = ctk.CTkButton(btn_grid, text="RETRACT", width=100, height=36,
                                           fg_color="gray40", hover_color="gray50",
                                           command=self._go_retract)
-        self.retract_btn.pack(side="left", padx=5)
+        self.retract_btn.grid(row=1, column=2, padx=5)
 
         # === Status Bar ===
         status_frame = ctk.CTkFrame(tab)
         status_frame.pack(fill="x", padx=10, pady=(0, 5))
 
         self.status_var = ctk.StringVar(value="Ready")
-        ctk.CTkLabel(status_frame, text="Status:", font=("", 11)).pack(side="left", padx=(10, 5), pady=5)
+        ctk.CTkLabel(status_frame, text="Status:", font=self._font(11)).pack(side="left", padx=(10, 5), pady=5)
         self.status_label = ctk.CTkLabel(status_frame, textvariable=self.status_var,
-                                          font=("", 11, "italic"))
+                                          font=self._font(11, slant="italic"))
         self.status_label.pack(side="left", pady=5)
 
     def _on_extend_changed(self, value):
         """Handle extend slider change"""
         val = int(value)
-        self.extend_label.configure(text=f"{val}°")
+        if not self._slider_changed("extend", val):
+            return
+        self.extend_text.set(f"{val}°")
         self.settings.extend_offset = val
-        self.bt_manager.send_command(CommandProtocol.set_extend(val))
+        self._queue_send("extend", EXTEND_COMMANDS[val])
 
     def _on_retract_changed(self, value):
         """Handle retract slider change"""
         val = int(value)
-        self.retract_label.configure(text=f"{val}°")
+        if not self._slider_changed("retract", val):
+            return
+        self.retract_text.set(f"{val}°")
         self.settings.retract_offset = val
-        self.bt_manager.send_command(CommandProtocol.set_retract(val))
+        self._queue_send("retract", RETRACT_COMMANDS[val])
 
     def _on_dwell_extend_changed(self, value):
         """Handle dwell extend slider change"""
-        self.dwell_extend_label.configure(text=f"{value:.1f}s")
-        ms = int(value * 1000)
+        tenths = int(round(value * 10))
+        if not self._slider_changed("dwell_extend", tenths):
+            return
+        self.dwell_extend_text.set(f"{tenths / 10:.1f}s")
+        ms = tenths * 100
         self.settings.dwell_extend_ms = ms
-        self.bt_manager.send_command(CommandProtocol.set_dwell_extend(ms))
+        self._queue_send("dwell_extend", DWELL_EXTEND_COMMANDS[tenths])
 
     def _on_dwell_retract_changed(self, value):
         """Handle dwell retract slider change"""
-        self.dwell_retract_label.configure(text=f"{value:.1f}s")
-        ms = int(value * 1000)
+        tenths = int(round(value * 10))
+        if not self._slider_changed("dwell_retract", tenths):
+            return
+        self.dwell_retract_text.set(f"{tenths / 10:.1f}s")
+        ms = tenths * 100
         self.settings.dwell_retract_ms = ms
-        self.bt_manager.send_command(CommandProtocol.set_dwell_retract(ms))
+        self._queue_send("dwell_retract", DWELL_RETRACT_COMMANDS[tenths])
+
+    def _slider_changed(self, key, value):
+        """Record a slider value, returning False if it is the same as last time"""
+        if self._last_slider_values.get(key) == value:
+            return False
+        self._last_slider_values[key] = value
+        return True
+
+    def _queue_send(self, key, command):
+        """Coalesce slider commands so a drag sends at most one command per key every 50 ms"""
+        self._pending_sends[key] = command
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(50, self._flush_pending)
+
+    def _debounced(self, delay_ms, key, fn, *args):
+        """Run fn(*args) once delay_ms after the last call for key, replacing any pending call"""
+        job = self._debounce_jobs.get(key)
+        if job:
+            self.root.after_cancel(job[0])
+        after_id = self.root.after(delay_ms, self._run_debounced, key)
+        self._debounce_jobs[key] = (after_id, fn, args)
+
+    def _run_debounced(self, key):
+        _, fn, args = self._debounce_jobs.pop(key)
+        fn(*args)
+
+    def _flush_debounced(self):
+        """Run all pending debounced calls now (used on close)"""
+        for key in list(self._debounce_jobs):
+            self.root.after_cancel(self._debounce_jobs[key][0])
+            self._run_debounced(key)
+
+    def _send_command(self, command):
+        """Queue a command (str, or pre-encoded bytes) for the Bluetooth writer thread"""
+        self.bt_manager.send_command(command)
+
+    def _flush_pending(self):
+        """Send the latest value of each pending slider command"""
+        pending = self._pending_sends
+        self._pending_sends = {}
+        self._flush_scheduled = False
+        for command in pending.values():
+            self._send_command(command)
 
     def _adjust_extend(self, delta):
         """Adjust extend position by delta (±1 degree)"""
@@ -370,10 +506,16 @@ class ActuatorControllerApp:
         output_frame = ctk.CTkFrame(tab)
         output_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        self.serial_output = ctk.CTkTextbox(output_frame, font=("Consolas", 11),
-                                             state="disabled", wrap="word")
+        self.serial_output = ctk.CTkTextbox(output_frame, font=self._font(11, family="Consolas"),
+                                             wrap="word")
         self.serial_output.pack(fill="both", expand=True)
 
+        # Left in the normal state so appends need no state toggling; edits are blocked instead
+        self.serial_output._textbox.configure(insertwidth=0)
+        self.serial_output._textbox.bind("<Key>", self._block_terminal_edit)
+        for event in ("<<Paste>>", "<<PasteSelection>>", "<<Cut>>", "<<Clear>>"):
+            self.serial_output._textbox.bind(event, lambda e: "break")
+
         # Configure tags for coloring
         self.serial_output._textbox.tag_configure("timestamp", foreground="gray")
         self.serial_output._textbox.tag_configure("sent", foreground="#3b8ed0")
@@ -384,7 +526,7 @@ class ActuatorControllerApp:
         input_frame = ctk.CTkFrame(tab, fg_color="transparent")
         input_frame.pack(fill="x", padx=10, pady=(0, 5))
 
-        self.serial_input = ctk.CTkEntry(input_frame, font=("Consolas", 12),
+        self.serial_input = ctk.CTkEntry(input_frame, font=self._font(12, family="Consolas"),
                                           placeholder_text="Enter command...")
         self.serial_input.pack(side="left", fill="x", expand=True, padx=(0, 10))
         self.serial_input.bind("<Return>", lambda e: self._send_serial_command())
@@ -409,7 +551,7 @@ class ActuatorControllerApp:
         for label, cmd in [("PING", "PING"), ("STATUS", "STATUS"), ("SETTINGS", "GET_SETTINGS")]:
             ctk.CTkButton(quick_frame, text=label, width=90, height=32,
                           fg_color="gray40", hover_color="gray50",
-                          command=lambda c=cmd: self._send_quick_command(c)).pack(side="left", padx=5)
+                          command=partial(self._send_quick_command, cmd)).pack(side="left", padx=5)
 
     def _create_settings_tab(self):
         """Create the settings tab - Touch-friendly version with 3x scaling"""
@@ -424,7 +566,7 @@ class ActuatorControllerApp:
         bt_frame.pack(fill="x", padx=30, pady=30)
 
         ctk.CTkLabel(bt_frame, text="Bluetooth Connection",
-                     font=("", 42, "bold")).pack(anchor="w", padx=30, pady=(30, 15))
+                     font=self._font(42, "bold")).pack(anchor="w", padx=30, pady=(30, 15))
 
         # Device list - Touch-friendly with larger font
         self.device_listbox = tk.Listbox(bt_frame, height=4, font=("Segoe UI", 33),
@@ -436,38 +578,40 @@ class ActuatorControllerApp:
         btn_frame = ctk.CTkFrame(bt_frame, fg_color="transparent")
         btn_frame.pack(fill="x", padx=30, pady=15)
 
-        ctk.CTkButton(btn_frame, text="Scan", width=268, height=64,
-                      font=("", 24), command=self._scan_devices).pack(side="left", padx=15)
-        ctk.CTkButton(btn_frame, text="Connect", width=268, height=64,
-                      font=("", 24), command=self._connect_device).pack(side="left", padx=15)
+        self.scan_btn = ctk.CTkButton(btn_frame, text="Scan", width=268, height=64,
+                                      font=self._font(24), command=self._scan_devices)
+        self.scan_btn.pack(side="left", padx=15)
+        self.connect_btn = ctk.CTkButton(btn_frame, text="Connect", width=268, height=64,
+                                         font=self._font(24), command=self._connect_device,
+                                         state="disabled" if self._connecting else "normal")
+        self.connect_btn.pack(side="left", padx=15)
         ctk.CTkButton(btn_frame, text="Disconnect", width=268, height=64,
-                      font=("", 24), command=self._disconnect_device).pack(side="left", padx=15)
+                      font=self._font(24), command=self._disconnect_device).pack(side="left", padx=15)
 
-        self.settings_status_var = ctk.StringVar(value="Not connected")
         ctk.CTkLabel(bt_frame, textvariable=self.settings_status_var,
-                     font=("", 33, "italic")).pack(anchor="w", padx=30, pady=(15, 30))
+                     font=self._font(33, slant="italic")).pack(anchor="w", padx=30, pady=(15, 30))
 
         # Paired device
         paired_frame = ctk.CTkFrame(scroll_frame)
         paired_frame.pack(fill="x", padx=30, pady=15)
 
         ctk.CTkLabel(paired_frame, text="Paired Device",
-                     font=("", 28, "bold")).pack(anchor="w", padx=30, pady=(30, 15))
+                     font=self._font(28, "bold")).pack(anchor="w", padx=30, pady=(30, 15))
 
         paired_name = self.settings.paired_device or "None"
         self.paired_label = ctk.CTkLabel(paired_frame, text=f"Device: {paired_name}",
-                                          font=("", 22))
+                                          font=self._font(22))
         self.paired_label.pack(anchor="w", padx=30, pady=15)
 
         ctk.CTkButton(paired_frame, text="Forget Device", width=241, height=64,
-                      font=("", 24), command=self._forget_device).pack(anchor="w", padx=30, pady=(0, 30))
+                      font=self._font(24), command=self._forget_device).pack(anchor="w", padx=30, pady=(0, 30))
 
         # Reset
         reset_frame = ctk.CTkFrame(scroll_frame)
         reset_frame.pack(fill="x", padx=30, pady=15)
 
         ctk.CTkButton(reset_frame, text="Reset All Settings", width=450, height=96,
-                      font=("", 24), fg_color="#dc2626", hover_color="#b91c1c",
+                      font=self._font(24), fg_color="#dc2626", hover_color="#b91c1c",
                       command=self._reset_settings).pack(padx=30, pady=45)
 
         # Scan on creation
@@ -481,42 +625,37 @@ class ActuatorControllerApp:
         info_frame = ctk.CTkFrame(tab)
         info_frame.pack(fill="x", padx=10, pady=10)
 
-        ctk.CTkLabel(info_frame, text="Firmware Update (OTA)", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(info_frame, text="Firmware Update (OTA)", font=self._font(14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
         ctk.CTkLabel(info_frame, text="Update ESP32 firmware wirelessly via Bluetooth.",
-                     font=("", 11)).pack(anchor="w", padx=10, pady=(0, 10))
+                     font=self._font(11)).pack(anchor="w", padx=10, pady=(0, 10))
 
         # File selection
         file_frame = ctk.CTkFrame(tab)
         file_frame.pack(fill="x", padx=10, pady=5)
 
-        ctk.CTkLabel(file_frame, text="Firmware File", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(file_frame, text="Firmware File", font=self._font(14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
 
-        self.firmware_path_var = ctk.StringVar(value="No file selected")
         ctk.CTkLabel(file_frame, textvariable=self.firmware_path_var,
-                     font=("", 11), wraplength=400).pack(anchor="w", padx=10, pady=5)
+                     font=self._font(11), wraplength=400).pack(anchor="w", padx=10, pady=5)
 
         ctk.CTkButton(file_frame, text="Browse...", width=120,
                       command=self._browse_firmware).pack(anchor="w", padx=10, pady=(0, 5))
 
-        self.firmware_info_var = ctk.StringVar(value="")
         ctk.CTkLabel(file_frame, textvariable=self.firmware_info_var,
-                     font=("", 10, "italic")).pack(anchor="w", padx=10, pady=(0, 10))
+                     font=self._font(10, slant="italic")).pack(anchor="w", padx=10, pady=(0, 10))
 
         # Progress
         progress_frame = ctk.CTkFrame(tab)
         progress_frame.pack(fill="x", padx=10, pady=5)
 
-        ctk.CTkLabel(progress_frame, text="Upload Progress", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(progress_frame, text="Upload Progress", font=self._font(14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
 
-        self.ota_progress_var = ctk.DoubleVar(value=0)
         self.ota_progress_bar = ctk.CTkProgressBar(progress_frame, variable=self.ota_progress_var,
                                                     width=400, height=15)
         self.ota_progress_bar.pack(fill="x", padx=10, pady=5)
-        self.ota_progress_bar.set(0)
 
-        self.ota_status_var = ctk.StringVar(value="Ready")
         ctk.CTkLabel(progress_frame, textvariable=self.ota_status_var,
-                     font=("", 11)).pack(anchor="w", padx=10, pady=(0, 10))
+                     font=self._font(11)).pack(anchor="w", padx=10, pady=(0, 10))
 
         # Upload controls
         upload_frame = ctk.CTkFrame(tab, fg_color="transparent")
@@ -536,30 +675,45 @@ class ActuatorControllerApp:
         version_frame = ctk.CTkFrame(tab)
         version_frame.pack(fill="x", padx=10, pady=10)
 
-        ctk.CTkLabel(version_frame, text="Device Info", font=("", 14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        ctk.CTkLabel(version_frame, text="Device Info", font=self._font(14, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
 
         ver_row = ctk.CTkFrame(version_frame, fg_color="transparent")
         ver_row.pack(anchor="w", padx=10, pady=5)
 
-        ctk.CTkLabel(ver_row, text="Version:", font=("", 11)).pack(side="left")
-        self.device_version_var = ctk.StringVar(value="Unknown")
+        ctk.CTkLabel(ver_row, text="Version:", font=self._font(11)).pack(side="left")
         ctk.CTkLabel(ver_row, textvariable=self.device_version_var,
-                     font=("", 11, "bold")).pack(side="left", padx=10)
+                     font=self._font(11, "bold")).pack(side="left", padx=10)
 
         ctk.CTkButton(version_frame, text="Check Version", width=120,
                       command=self._check_firmware_version).pack(anchor="w", padx=10, pady=(0, 10))
 
     # === Settings Tab Methods ===
     def _scan_devices(self):
+        self.scan_btn.configure(state="disabled")
+        threading.Thread(target=self._scan_worker, daemon=True).start()
+
+    def _scan_worker(self):
+        devices = self.bt_manager.scan_for_devices()
+        self.root.after(0, lambda: self._scan_apply(devices))
+
+    def _scan_apply(self, devices):
+        self.scan_btn.configure(state="normal")
+        self.devices = devices
         self.device_listbox.delete(0, tk.END)
-        self.devices = self.bt_manager.scan_for_devices()
         if not self.devices:
             self.device_listbox.insert(tk.END, "No devices found")
         else:
-            for port, desc, hwid in self.devices:
-                self.device_listbox.insert(tk.END, f"{port} - {desc}")
+            self.device_listbox.insert(tk.END, *(f"{port} - {desc}" for port, desc, hwid in self.devices))
+
+    def _set_connecting(self, connecting):
+        self._connecting = connecting
+        if self.connect_btn:
+            self.connect_btn.configure(state="disabled" if connecting else "normal")
 
     def _connect_device(self):
+        if self._connecting:
+            return
+
         selection = self.device_listbox.curselection()
         if not selection or not self.devices:
             messagebox.showwarning("No Selection", "Please select a device")
@@ -571,13 +725,22 @@ class ActuatorControllerApp:
 
         port, desc, hwid = self.devices[idx]
         self.settings_status_var.set(f"Connecting to {port}...")
-        self.root.update()
+        self._set_connecting(True)
 
-        if self.bt_manager.connect(port):
-            self.settings.paired_device = desc
-            self.settings.paired_device_address = port
-            self.paired_label.configure(text=f"Device: {desc}")
-            self._update_settings_status()
+        def connect():
+            connected = self.bt_manager.connect(port)
+            self.root.after(0, lambda: self._connect_done(port, desc, connected))
+
+        threading.Thread(target=connect, daemon=True).start()
+
+    def _connect_done(self, port, desc, connected):
+        self._set_connecting(False)
+        if connected:
+            # Status labels are refreshed by _update_connection_ui
+            if (self.settings.paired_device, self.settings.paired_device_address) != (desc, port):
+                self.settings.paired_device = desc
+                self.settings.paired_device_address = port
+                self.paired_label.configure(text=f"Device: {desc}")
             self._sync_settings_to_esp32()
         else:
             messagebox.showerror("Connection Failed", f"Could not connect to {port}")
@@ -585,7 +748,6 @@ class ActuatorControllerApp:
 
     def _disconnect_device(self):
         self.bt_manager.disconnect()
-        self._update_settings_status()
 
     def _forget_device(self):
         self.settings.paired_device = None
@@ -624,20 +786,25 @@ class ActuatorControllerApp:
         if not self.bt_manager.is_connected():
             messagebox.showwarning("Not Connected", "Please connect first")
             return
-        self.bt_manager.send_command("GET_VERSION")
+        self._send_command("GET_VERSION")
         self._append_serial_output(">>> GET_VERSION", "sent")
 
     def _start_ota_upload(self):
         if not self.bt_manager.is_connected():
             messagebox.showwarning("Not Connected", "Please connect first")
             return
-        if not self.ota_file_path or not os.path.exists(self.ota_file_path):
+        if not self.ota_file_path:
+            messagebox.showwarning("No File", "Please select a firmware file")
+            return
+        try:
+            # One stat for existence and size
+            file_size = os.stat(self.ota_file_path).st_size
+        except OSError:
             messagebox.showwarning("No File", "Please select a firmware file")
             return
         if self.ota_in_progress:
             return
 
-        file_size = os.path.getsize(self.ota_file_path)
         if not messagebox.askyesno("Confirm Upload",
                                     f"Upload firmware?\n\nFile: {os.path.basename(self.ota_file_path)}\n"
                                     f"Size: {file_size:,} bytes"):
@@ -655,82 +822,130 @@ class ActuatorControllerApp:
     def _abort_ota_upload(self):
         if self.ota_in_progress:
             self.ota_abort_flag.set()
-            self.bt_manager.send_command("OTA_ABORT")
+            # Drop queued firmware so no image data follows the abort command
+            self.bt_manager.discard_bytes()
+            self._send_command("OTA_ABORT")
             self._append_serial_output(">>> OTA_ABORT", "sent")
 
     def _ota_upload_thread(self):
         try:
-            file_size = os.path.getsize(self.ota_file_path)
-            chunk_size = 512
-            ready_timeout = 5.0
+            # Map the image instead of reading it; the kernel pages it in as chunks are sent
+            with open(self.ota_file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as firmware:
+                self._ota_send_firmware(firmware)
 
-            self.ota_ready_event.clear()
-            self.ota_error_message = None
-
-            self.bt_manager.send_command(f"OTA_START:{file_size}")
-            self.root.after(0, lambda: self._append_serial_output(f">>> OTA_START:{file_size}", "sent"))
-            self.root.after(0, lambda: self.ota_status_var.set("Waiting for device ready..."))
+        except Exception as e:
+            self._ota_finish(f"Error: {str(e)}")
+        finally:
+            # Whatever ended the upload, don't leave image data queued behind it
+            self.bt_manager.discard_bytes()
+
+    def _ota_send_firmware(self, firmware):
+        """Run the OTA handshake and stream the mapped firmware image"""
+        file_size = len(firmware)
+        chunk_size = self.OTA_CHUNK_SIZE
+        ready_timeout = 5.0
+
+        self.ota_ready_event.clear()
+        self.ota_ack_event.clear()
+        self.ota_complete_event.clear()
+        self.ota_total_bytes = file_size
+        self.ota_acked_bytes = 0
+        self.ota_error_message = None
 
-            if not self.ota_ready_event.wait(timeout=ready_timeout):
-                if self.ota_error_message:
-                    self._ota_finish(f"Device error: {self.ota_error_message}")
-                else:
-                    self._ota_finish("Timeout waiting for device ready")
-                return
+        start_cmd = f"OTA_START:{file_size}:{chunk_size}"
+        self.bt_manager.send_command(start_cmd)
+        self.root.after(0, lambda: self._append_serial_output(f">>> {start_cmd}", "sent"))
+        self.root.after(0, lambda: self.ota_status_var.set("Waiting for device ready..."))
 
+        if not self.ota_ready_event.wait(timeout=ready_timeout):
             if self.ota_error_message:
-                return
-
-            if self.ota_abort_flag.is_set():
-                self._ota_finish("Aborted by user")
-                return
-
-            bytes_sent = 0
-            last_success_time = time.time()
+                self._ota_finish(f"Device error: {self.ota_error_message}")
+            else:
+                self._ota_finish("Timeout waiting for device ready")
+            return
 
-            with open(self.ota_file_path, 'rb') as f:
-                while bytes_sent < file_size:
-                    if self.ota_abort_flag.is_set():
-                        self._ota_finish("Aborted by user")
-                        return
+        if self.ota_error_message:
+            return
 
-                    if not self.bt_manager.is_connected():
-                        self._ota_finish("Connection lost")
-                        return
+        if self.ota_abort_flag.is_set():
+            self._ota_finish("Aborted by user")
+            return
 
-                    if time.time() - last_success_time > 5.0:
-                        self._ota_finish("Upload timeout")
-                        return
+        # Locals for the send loop, which runs once per chunk
+        bm = self.bt_manager
+        abort_flag = self.ota_abort_flag
+        ack_event = self.ota_ack_event
+        schedule = self.root.after
+        update_progress = self._update_ota_progress
+        monotonic = time.monotonic
+        send_timeout = 5.0  # Longest a chunk may wait for room in the writer queue
+        ui_interval = self.OTA_UI_INTERVAL
+        ui_bytes = self.OTA_UI_BYTES
+        window_bytes = self.OTA_WINDOW_BYTES
+        ack_wait = self.OTA_ACK_WAIT
+
+        bytes_sent = 0
+        last_ui_time = 0.0
+        last_ui_bytes = 0
+
+        for start in range(0, file_size, chunk_size):
+            if abort_flag.is_set():
+                self._ota_finish("Aborted by user")
+                return
 
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
+            if self.ota_error_message:
+                return  # _h_err has already reported the failure
 
-                    if not self.bt_manager.send_bytes(chunk):
-                        self._ota_finish("Failed to send data")
-                        return
+            if not bm.is_connected():
+                self._ota_finish("Connection lost")
+                return
 
-                    last_success_time = time.time()
-                    bytes_sent += len(chunk)
-                    progress = bytes_sent / file_size
+            # Slicing the map gives bytes; the writer thread needs its own copy anyway
+            chunk = firmware[start:start + chunk_size]
+            if not bm.send_bytes(chunk, timeout=send_timeout):
+                self._ota_finish("Upload timeout" if bm.is_connected() else "Connection lost")
+                return
 
-                    self.root.after(0, lambda p=progress, b=bytes_sent, t=file_size:
-                                    self._update_ota_progress(p, b, t))
-                    time.sleep(0.02)
+            bytes_sent = start + len(chunk)
+            now = monotonic()
+
+            # Throttle progress redraws instead of queueing one per chunk
+            if (now - last_ui_time >= ui_interval
+                    or bytes_sent - last_ui_bytes >= ui_bytes
+                    or bytes_sent == file_size):
+                last_ui_time = now
+                last_ui_bytes = bytes_sent
+                schedule(0, update_progress, bytes_sent / file_size, bytes_sent, file_size)
+
+            # Pace on the device's progress reports instead of a fixed delay
+            if bytes_sent - self.ota_acked_bytes >= window_bytes:
+                ack_event.wait(timeout=ack_wait)
+                ack_event.clear()
+
+        # Let the last chunks drain before the device is given time to verify
+        if not self.bt_manager.sync():
+            self._ota_finish("Failed to send data")
+            return
 
-            self.root.after(0, lambda: self.ota_status_var.set("Verifying..."))
-            time.sleep(2)
+        self.root.after(0, self._append_serial_output, f">>> OTA data sent: {bytes_sent:,} bytes", "sent")
+        self.root.after(0, lambda: self.ota_status_var.set("Verifying..."))
+        # Finish as soon as the device reports it is done (or drops the link to reboot)
+        confirmed = self.ota_complete_event.wait(timeout=10)
+        if self.ota_error_message:
+            return  # _h_err has already reported the failure
+        if confirmed:
             self._ota_finish("Upload complete - device restarting", success=True)
-
-        except Exception as e:
-            self._ota_finish(f"Error: {str(e)}")
+        else:
+            # Firmware that sends no completion message still reboots into the new image
+            self._ota_finish("Upload sent - device did not confirm", success=True, confirmed=False)
 
     def _update_ota_progress(self, progress, bytes_sent, total):
         self.ota_progress_var.set(progress)
         self.ota_progress_bar.set(progress)
         self.ota_status_var.set(f"Uploading: {bytes_sent:,} / {total:,} bytes ({progress * 100:.1f}%)")
 
-    def _ota_finish(self, message, success=False):
+    def _ota_finish(self, message, success=False, confirmed=True):
         def update_ui():
             self.ota_in_progress = False
             self.upload_btn.configure(state="normal")
@@ -740,7 +955,12 @@ class ActuatorControllerApp:
             if success:
                 self.ota_progress_var.set(1.0)
                 self.ota_progress_bar.set(1.0)
-                messagebox.showinfo("OTA Complete", "Firmware uploaded!\nDevice restarting.")
+                if confirmed:
+                    messagebox.showinfo("OTA Complete", "Firmware uploaded!\nDevice restarting.")
+                else:
+                    messagebox.showwarning("OTA Unconfirmed",
+                                           "Firmware was sent, but the device did not confirm the update.\n"
+                                           "Check the device version once it reconnects.")
             else:
                 self.ota_progress_var.set(0)
                 self.ota_progress_bar.set(0)
@@ -756,7 +976,7 @@ class ActuatorControllerApp:
             self._append_serial_output("Not connected!", "error")
             return
         self._append_serial_output(f">>> {cmd}", "sent")
-        self.bt_manager.send_command(cmd)
+        self._send_command(cmd)
         self.serial_input.delete(0, tk.END)
 
     def _send_quick_command(self, cmd):
@@ -764,21 +984,52 @@ class ActuatorControllerApp:
             self._append_serial_output("Not connected!", "error")
             return
         self._append_serial_output(f">>> {cmd}", "sent")
-        self.bt_manager.send_command(cmd)
+        self._send_command(cmd)
 
     def _append_serial_output(self, text, tag="received"):
-        self.serial_output.configure(state="normal")
-        timestamp = datetime.now().strftime("[%H:%M:%S] ")
-        self.serial_output._textbox.insert(tk.END, timestamp, "timestamp")
-        self.serial_output._textbox.insert(tk.END, text + "\n", tag)
-        self.serial_output.configure(state="disabled")
+        # The timestamp only changes once a second, so format it once per second
+        sec = int(time.time())
+        if sec != self._last_ts_sec:
+            self._last_ts_str = time.strftime("[%H:%M:%S] ", time.localtime(sec))
+            self._last_ts_sec = sec
+        self._serial_pending.append((self._last_ts_str, text, tag))
+
+    def _flush_serial_output(self):
+        """Write all pending terminal lines with a single insert"""
+        if not self._serial_pending:
+            return
+        if "Terminal" not in self._tabs_built:
+            # Hold output until the terminal is first opened
+            del self._serial_pending[:-self.SERIAL_MAX_LINES]
+            return
+        pending = self._serial_pending
+        self._serial_pending = []
+
+        chunks = []
+        for timestamp, text, tag in pending:
+            chunks.extend((timestamp, "timestamp", text + "\n", tag))
+
+        self.serial_output._textbox.insert(tk.END, *chunks)
+        self._serial_line_count += len(pending)
+        excess = self._serial_line_count - self.SERIAL_MAX_LINES
+        if excess > 0:
+            self.serial_output._textbox.delete("1.0", f"{excess + 1}.0")
+            self._serial_line_count = self.SERIAL_MAX_LINES
         if self.auto_scroll.get():
             self.serial_output._textbox.see(tk.END)
 
     def _clear_serial_output(self):
-        self.serial_output.configure(state="normal")
         self.serial_output._textbox.delete(1.0, tk.END)
-        self.serial_output.configure(state="disabled")
+        self._serial_line_count = 0
+        self._serial_pending = []
+
+    def _block_terminal_edit(self, event):
+        """Keep the terminal read-only while still allowing copy, select-all and navigation"""
+        if event.state & 0x4 and event.keysym.lower() in ("c", "a"):
+            return None
+        if event.keysym in self.TERMINAL_NAV_KEYS:
+            return None
+        return "break"
 
     # === Control Methods ===
     def _set_actuator_type(self, type_val):
@@ -790,20 +1041,24 @@ class ActuatorControllerApp:
             self.type_6600_btn.configure(fg_color=["#3b8ed0", "#1f6aa5"])
             self.type_6700_btn.configure(fg_color="gray40")
         self.settings.actuator_type = type_val
-        self.bt_manager.send_command(CommandProtocol.set_type(type_val))
+        self._send_command(TYPE_COMMANDS.get(type_val) or CommandProtocol.set_type(type_val))
 
     def _on_speed_changed(self, value):
         val = int(value)
-        self.speed_label.configure(text=f"{val}%")
+        self.speed_text.set(f"{val}%")
+        # Only the settled value of a drag is saved and sent
+        self._debounced(self.SPEED_DEBOUNCE_MS, "speed", self._apply_speed, val)
+
+    def _apply_speed(self, val):
         self.settings.speed_percent = val
-        self.bt_manager.send_command(CommandProtocol.set_speed(val))
+        self._send_command(SPEED_COMMANDS[val])
 
     def _adjust_cycles(self, delta):
         current = self.cycles_var.get()
         new_val = max(1, min(100000, current + delta))
         self.cycles_var.set(new_val)
         self.target_cycles = new_val
-        self.bt_manager.send_command(CommandProtocol.set_cycles(new_val))
+        self._send_command(CommandProtocol.set_cycles(new_val))
         self._update_progress()
 
     def _on_infinite_changed(self):
@@ -817,21 +1072,21 @@ class ActuatorControllerApp:
         if not self.bt_manager.is_connected():
             messagebox.showwarning("Not Connected", "Please connect first")
             return
-        self.bt_manager.send_command(CommandProtocol.go_home())
+        self._send_command(CommandProtocol.go_home())
         self.status_var.set("Moving to HOME")
 
     def _go_extend(self):
         if not self.bt_manager.is_connected():
             messagebox.showwarning("Not Connected", "Please connect first")
             return
-        self.bt_manager.send_command(CommandProtocol.go_extend())
+        self._send_command(CommandProtocol.go_extend())
         self.status_var.set("Moving to EXTEND")
 
     def _go_retract(self):
         if not self.bt_manager.is_connected():
             messagebox.showwarning("Not Connected", "Please connect first")
             return
-        self.bt_manager.send_command(CommandProtocol.go_retract())
+        self._send_command(CommandProtocol.go_retract())
         self.status_var.set("Moving to RETRACT")
 
     def _start_cycles(self):
@@ -842,13 +1097,13 @@ class ActuatorControllerApp:
         self.current_cycle = 0
 
         if self.infinite_cycles.get():
-            self.bt_manager.send_command(CommandProtocol.set_cycles(0))
+            self._send_command(CommandProtocol.set_cycles(0))
         else:
             self.target_cycles = self.cycles_var.get()
-            self.bt_manager.send_command(CommandProtocol.set_cycles(self.target_cycles))
+            self._send_command(CommandProtocol.set_cycles(self.target_cycles))
 
         self._update_progress()
-        self.bt_manager.send_command(CommandProtocol.start())
+        self._send_command(CommandProtocol.start())
 
         self.is_running = True
         self.is_paused = False
@@ -860,11 +1115,11 @@ class ActuatorControllerApp:
             return
 
         if self.is_paused:
-            self.bt_manager.send_command(CommandProtocol.resume())
+            self._send_command(CommandProtocol.resume())
             self.is_paused = False
             self.status_var.set("Resumed")
         else:
-            self.bt_manager.send_command(CommandProtocol.pause())
+            self._send_command(CommandProtocol.pause())
             self.is_paused = True
             self.status_var.set("Paused")
 
@@ -874,7 +1129,7 @@ class ActuatorControllerApp:
         if not self.bt_manager.is_connected():
             return
 
-        self.bt_manager.send_command(CommandProtocol.stop())
+        self._send_command(CommandProtocol.stop())
         self.is_running = False
         self.is_paused = False
         self._update_button_states()
@@ -913,57 +1168,84 @@ class ActuatorControllerApp:
 
     # === Data Handling ===
     def _on_data_received(self, data):
-        self.root.after(0, lambda: self._process_response(data))
+        self._rx_buffer.append(data)
+
+    def _drain_rx(self):
+        """Process received lines and refresh the terminal once per frame"""
+        try:
+            while self._rx_buffer:
+                self._process_response(self._rx_buffer.popleft())
+            self._flush_serial_output()
+        finally:
+            self.root.after(50, self._drain_rx)
 
     def _process_response(self, data):
         self._append_serial_output(data, "received")
 
         resp_type, resp_data = parse_response(data)
 
-        if resp_type == "PONG":
-            self.status_var.set("Connected - Ready")
-        elif resp_type == "STATUS":
-            state = resp_data.get("STATE", "UNKNOWN")
-            pos = resp_data.get("POS", 0)
-            self.status_var.set(f"{state} - Position: {pos}°")
-        elif resp_type == "PROGRESS":
-            cycle = resp_data.get("CYCLE", 0)
-            target = resp_data.get("TARGET", 0)
-            self.current_cycle = cycle
-            if not self.infinite_cycles.get():
-                self.target_cycles = target
-            self._update_progress()
-        elif resp_type == "COMPLETE":
-            cycles = resp_data.get("CYCLES", 0)
-            self.status_var.set(f"Complete - {cycles} cycles finished")
-            self.is_running = False
-            self.is_paused = False
-            self._update_button_states()
-        elif resp_type == "OK":
-            if "OTA_READY" in data:
-                self.ota_status_var.set("Device ready - sending...")
-                self.ota_ready_event.set()
-        elif resp_type == "VERSION":
-            version = data.split(":", 1)[1] if ":" in data else "Unknown"
-            self.device_version_var.set(version)
-        elif resp_type == "OTA_PROGRESS":
-            parts = data.split(":")
-            if len(parts) >= 2:
-                try:
-                    percent = int(parts[1]) / 100
-                    self.ota_progress_var.set(percent)
-                    self.ota_progress_bar.set(percent)
-                except ValueError:
-                    pass
-        elif resp_type == "ERR":
-            self.status_var.set(f"Error: {data}")
-            if "OTA" in data:
-                self.ota_error_message = data
-                self.ota_ready_event.set()
-                if self.ota_in_progress:
-                    self._ota_finish(f"OTA Error: {data}")
+        handler = self._resp_handlers.get(resp_type)
+        if handler:
+            handler(resp_data, data)
+
+    def _h_pong(self, resp_data, data):
+        self.status_var.set("Connected - Ready")
+
+    def _h_status(self, resp_data, data):
+        state = resp_data.get("STATE", "UNKNOWN")
+        pos = resp_data.get("POS", 0)
+        self.status_var.set(f"{state} - Position: {pos}°")
+
+    def _h_progress(self, resp_data, data):
+        cycle = resp_data.get("CYCLE", 0)
+        target = resp_data.get("TARGET", 0)
+        self.current_cycle = cycle
+        if not self.infinite_cycles.get():
+            self.target_cycles = target
+        self._update_progress()
+
+    def _h_complete(self, resp_data, data):
+        cycles = resp_data.get("CYCLES", 0)
+        self.status_var.set(f"Complete - {cycles} cycles finished")
+        self.is_running = False
+        self.is_paused = False
+        self._update_button_states()
+
+    def _h_ok(self, resp_data, data):
+        if "OTA_READY" in data:
+            self.ota_status_var.set("Device ready - sending...")
+            self.ota_ready_event.set()
+        elif "OTA_DONE" in data:
+            self.ota_complete_event.set()
+
+    def _h_ota_done(self, resp_data, data):
+        self.ota_complete_event.set()
+
+    def _h_version(self, resp_data, data):
+        version = data.split(":", 1)[1] if ":" in data else "Unknown"
+        self.device_version_var.set(version)
+
+    def _h_ota_progress(self, resp_data, data):
+        pct = resp_data.get("PCT")
+        if pct is not None:
+            percent = pct / 100
+            self.ota_progress_var.set(percent)
+            self.ota_acked_bytes = int(self.ota_total_bytes * percent)
+            self.ota_ack_event.set()
+
+    def _h_err(self, resp_data, data):
+        self.status_var.set(f"Error: {data}")
+        if "OTA" in data:
+            self.ota_error_message = data
+            self.ota_ready_event.set()
+            self.ota_complete_event.set()
+            if self.ota_in_progress:
+                self._ota_finish(f"OTA Error: {data}")
 
     def _on_connection_changed(self, connected):
+        if not connected:
+            # The device drops the link when it reboots into new firmware
+            self.ota_complete_event.set()
         self.root.after(0, lambda: self._update_connection_ui(connected))
 
     def _update_connection_ui(self, connected):
@@ -993,55 +1275,63 @@ class ActuatorControllerApp:
         def set_values():
             # Position sliders
             self.extend_slider.set(self.settings.extend_offset)
-            self.extend_label.configure(text=f"{self.settings.extend_offset}°")
+            self.extend_text.set(f"{self.settings.extend_offset}°")
             self.retract_slider.set(self.settings.retract_offset)
-            self.retract_label.configure(text=f"{self.settings.retract_offset}°")
+            self.retract_text.set(f"{self.settings.retract_offset}°")
 
             # Timing sliders
             dwell_ext_sec = self.settings.dwell_extend_ms / 1000.0
             dwell_ret_sec = self.settings.dwell_retract_ms / 1000.0
             self.dwell_extend_slider.set(dwell_ext_sec)
-            self.dwell_extend_label.configure(text=f"{dwell_ext_sec:.1f}s")
+            self.dwell_extend_text.set(f"{dwell_ext_sec:.1f}s")
             self.dwell_retract_slider.set(dwell_ret_sec)
-            self.dwell_retract_label.configure(text=f"{dwell_ret_sec:.1f}s")
+            self.dwell_retract_text.set(f"{dwell_ret_sec:.1f}s")
 
             # Speed
             self.speed_var.set(self.settings.speed_percent)
-            self.speed_label.configure(text=f"{self.settings.speed_percent}%")
+            self.speed_text.set(f"{self.settings.speed_percent}%")
 
         self.root.after(200, set_values)
 
     def _auto_connect(self):
         port = self.settings.paired_device_address
-        if port:
+        if port and not self._connecting:
             self.status_var.set(f"Connecting to {port}...")
-            self.root.update()
+            self._set_connecting(True)
 
             def connect():
-                if self.bt_manager.connect(port):
-                    self.root.after(0, self._sync_settings_to_esp32)
-                else:
-                    self.root.after(0, lambda: self.status_var.set("Auto-connect failed"))
+                connected = self.bt_manager.connect(port)
+                self.root.after(0, lambda: self._auto_connect_done(connected))
 
             threading.Thread(target=connect, daemon=True).start()
 
+    def _auto_connect_done(self, connected):
+        self._set_connecting(False)
+        if connected:
+            self._sync_settings_to_esp32()
+        else:
+            self.status_var.set("Auto-connect failed")
+
     def _sync_settings_to_esp32(self):
         if not self.bt_manager.is_connected():
             return
 
-        self.bt_manager.send_command(CommandProtocol.set_type(self.settings.actuator_type))
-        self.bt_manager.send_command(CommandProtocol.set_extend(self.settings.extend_offset))
-        self.bt_manager.send_command(CommandProtocol.set_retract(self.settings.retract_offset))
-        self.bt_manager.send_command(CommandProtocol.set_dwell_extend(self.settings.dwell_extend_ms))
-        self.bt_manager.send_command(CommandProtocol.set_dwell_retract(self.settings.dwell_retract_ms))
-        self.bt_manager.send_command(CommandProtocol.set_speed(self.settings.speed_percent))
+        cycles = 0 if self.infinite_cycles.get() else self.cycles_var.get()
 
-        if self.infinite_cycles.get():
-            self.bt_manager.send_command(CommandProtocol.set_cycles(0))
-        else:
-            self.bt_manager.send_command(CommandProtocol.set_cycles(self.cycles_var.get()))
+        # Send the full settings set as one write instead of one per command
+        self.bt_manager.send_many([
+            CommandProtocol.set_type(self.settings.actuator_type),
+            CommandProtocol.set_extend(self.settings.extend_offset),
+            CommandProtocol.set_retract(self.settings.retract_offset),
+            CommandProtocol.set_dwell_extend(self.settings.dwell_extend_ms),
+            CommandProtocol.set_dwell_retract(self.settings.dwell_retract_ms),
+            CommandProtocol.set_speed(self.settings.speed_percent),
+            CommandProtocol.set_cycles(cycles),
+        ])
 
     def _on_close(self):
+        self._flush_debounced()
+        self.settings.flush()
         self.bt_manager.disconnect()
         self.root.destroy()
 
@@ -3,14 +3,32 @@ Bluetooth Manager for Actuator Controller
 Handles Bluetooth device scanning, pairing, and serial communication
 """
 
+import itertools
+import queue
+import re
 import serial
 import serial.tools.list_ports
 import threading
 import time
-from typing import Callable, Optional, List, Tuple
+from typing import Callable, Optional, List, Tuple, Union
+
+# Port descriptions/hardware IDs that identify Bluetooth serial ports
+_BT_DESC_RE = re.compile(r"bluetooth|bth|serial over|standard serial", re.IGNORECASE)
+_BT_HWID_RE = re.compile(r"bthenum", re.IGNORECASE)
+
+# Writer queue priorities: commands go ahead of queued bulk data, stop goes last
+_TX_COMMAND = 0
+_TX_DATA = 1
+_TX_STOP = 2
 
 
 class BluetoothManager:
+    # Bulk data items allowed in flight (back-pressure for OTA), how many queued items are
+    # taken at once, and the most bytes merged into one write (write_timeout applies to each write)
+    TX_DATA_SLOTS = 16
+    TX_BATCH_ITEMS = 16
+    TX_BATCH_BYTES = 4096
+
     def __init__(self):
         self.serial_port: Optional[serial.Serial] = None
         self.connected = False
@@ -24,6 +42,12 @@ class BluetoothManager:
         self._reader_thread: Optional[threading.Thread] = None
         self._stop_reader = threading.Event()
 
+        # Writer thread; the only thread that writes to the port
+        self._writer_thread: Optional[threading.Thread] = None
+        self._tx_q: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._tx_seq = itertools.count()
+        self._tx_slots = threading.Semaphore(self.TX_DATA_SLOTS)
+
     def scan_for_devices(self) -> List[Tuple[str, str, str]]:
         """
         Scan for available COM ports (Bluetooth serial ports)
@@ -47,13 +71,8 @@ class BluetoothManager:
         ports = serial.tools.list_ports.comports()
 
         for port in ports:
-            desc_lower = port.description.lower()
-            hwid_lower = port.hwid.lower() if port.hwid else ""
-
             # Look for Bluetooth-related keywords
-            if any(kw in desc_lower for kw in ["bluetooth", "bth", "serial over", "standard serial"]):
-                devices.append((port.device, port.description, port.hwid))
-            elif "bthenum" in hwid_lower:
+            if _BT_DESC_RE.search(port.description) or (port.hwid and _BT_HWID_RE.search(port.hwid)):
                 devices.append((port.device, port.description, port.hwid))
 
         return devices
@@ -64,20 +83,33 @@ class BluetoothManager:
         """
         if self.connected:
             self.disconnect()
+        else:
+            # A connection lost to an I/O error leaves its port and threads behind
+            self._teardown()
 
         try:
             self.serial_port = serial.Serial(
                 port=port,
                 baudrate=baudrate,
-                timeout=timeout,
+                timeout=None,  # Reader blocks; disconnect() wakes it with cancel_read()
                 write_timeout=timeout
             )
             self.port_name = port
             self.connected = True
 
-            # Start reader thread
-            self._stop_reader.clear()
-            self._reader_thread = threading.Thread(target=self._read_loop, daemon=True)
+            # Start writer thread, with a fresh queue for this connection
+            self._tx_q = queue.PriorityQueue()
+            self._tx_slots = threading.Semaphore(self.TX_DATA_SLOTS)
+            self._writer_thread = threading.Thread(target=self._write_loop,
+                                                   args=(self.serial_port, self._tx_q, self._tx_slots),
+                                                   daemon=True)
+            self._writer_thread.start()
+
+            # Start reader thread, with its own stop flag and port so a stale reader
+            # can never pick up a later connection
+            self._stop_reader = threading.Event()
+            self._reader_thread = threading.Thread(target=self._read_loop,
+                                                   args=(self.serial_port, self._stop_reader), daemon=True)
             self._reader_thread.start()
 
             # Notify connection change
@@ -98,11 +130,33 @@ class BluetoothManager:
 
     def disconnect(self):
         """Disconnect from the current port"""
+        self._teardown()
+
+        self.connected = False
+        self.port_name = None
+
+        if self.on_connection_changed:
+            self.on_connection_changed(False)
+
+    def _teardown(self):
+        """Stop the reader and writer threads and close the port"""
         self._stop_reader.set()
 
+        # Wake the reader out of its blocking read so it sees the stop flag now
+        if self.serial_port:
+            try:
+                self.serial_port.cancel_read()
+            except Exception:
+                pass
+
         if self._reader_thread and self._reader_thread.is_alive():
             self._reader_thread.join(timeout=1.0)
 
+        # Let the writer send what is already queued, then stop it
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._enqueue(_TX_STOP, None)
+            self._writer_thread.join(timeout=1.0)
+
         if self.serial_port:
             try:
                 self.serial_port.close()
@@ -110,69 +164,175 @@ class BluetoothManager:
                 pass
 
         self.serial_port = None
-        self.connected = False
-        self.port_name = None
 
-        if self.on_connection_changed:
-            self.on_connection_changed(False)
+    def _enqueue(self, priority: int, item):
+        # The sequence number keeps items of equal priority in order
+        self._tx_q.put((priority, next(self._tx_seq), item))
 
-    def send_command(self, command: str) -> bool:
-        """Send a command to the ESP32"""
+    def send_command(self, command: Union[str, bytes]) -> bool:
+        """Queue a command for the ESP32 (never blocks; goes ahead of queued bulk data)"""
         if not self.connected or not self.serial_port:
             return False
 
-        try:
-            cmd = command.strip() + "\n"
-            self.serial_port.write(cmd.encode('utf-8'))
-            self.serial_port.flush()
-            return True
-        except serial.SerialException as e:
-            print(f"Send failed: {e}")
-            self._handle_disconnect()
-            return False
+        self._enqueue(_TX_COMMAND, encode_command(command))
+        return True
 
-    def send_bytes(self, data: bytes) -> bool:
-        """Send raw bytes to the ESP32 (for OTA)"""
+    def send_bytes(self, data: bytes, timeout: Optional[float] = None) -> bool:
+        """
+        Queue bulk raw bytes for the ESP32 (OTA data)
+        Blocks while TX_DATA_SLOTS items are in flight, which paces the sender to the link;
+        returns False if no slot frees up within timeout
+        """
         if not self.connected or not self.serial_port:
             return False
 
-        try:
-            self.serial_port.write(data)
-            self.serial_port.flush()
-            return True
-        except serial.SerialException as e:
-            print(f"Send bytes failed: {e}")
-            self._handle_disconnect()
+        if not self._tx_slots.acquire(timeout=timeout):
+            return False
+        # Copy views now; the caller may release the buffer before it is written
+        self._enqueue(_TX_DATA, data if isinstance(data, bytes) else bytes(data))
+        return True
+
+    def send_many(self, commands: List[Union[str, bytes]]) -> bool:
+        """Send several commands to the ESP32 in a single write"""
+        return self.send_command(encode_commands(commands))
+
+    def discard_bytes(self) -> int:
+        """
+        Drop bulk data still waiting in the writer queue (e.g. an aborted OTA)
+        Commands and sync markers are kept; returns the number of chunks dropped
+        """
+        tx_q, slots = self._tx_q, self._tx_slots
+        kept = []
+        dropped = 0
+        while True:
+            try:
+                item = tx_q.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == _TX_DATA and isinstance(item[2], bytes):
+                dropped += 1
+            else:
+                kept.append(item)
+
+        # Re-queued items keep their sequence numbers, so their order is unchanged
+        for item in kept:
+            tx_q.put(item)
+        for _ in range(dropped):
+            slots.release()
+        return dropped
+
+    def sync(self) -> bool:
+        """Block until everything queued so far has been transmitted"""
+        if not self.connected or not self.serial_port:
             return False
 
+        # Queued behind the bulk data, so it is set once everything before it is written
+        done = threading.Event()
+        self._enqueue(_TX_DATA, done)
+        while not done.wait(timeout=0.1):
+            if not self.connected:
+                return False
+        return self.connected
+
+    def _write_loop(self, port: serial.Serial, tx_q: "queue.PriorityQueue", slots: threading.Semaphore):
+        """Background thread that writes queued data, batching whatever has queued up"""
+        buf = bytearray()
+        held = 0  # Data slots for the items in buf, freed once they are written
+
+        def write():
+            nonlocal held
+            self._write_buffer(port, buf)
+            for _ in range(held):
+                slots.release()
+            held = 0
+
+        while True:
+            # Take only about one write's worth, so a later command is not stuck behind data
+            items = [tx_q.get()]
+            size = _item_size(items[0])
+            try:
+                while len(items) < self.TX_BATCH_ITEMS and size < self.TX_BATCH_BYTES:
+                    items.append(tx_q.get_nowait())
+                    size += _item_size(items[-1])
+            except queue.Empty:
+                pass
+
+            for priority, _, item in items:
+                if isinstance(item, bytes):
+                    if buf and len(buf) + len(item) > self.TX_BATCH_BYTES:
+                        write()
+                    buf += item
+                    if priority == _TX_DATA:
+                        held += 1
+                    continue
+
+                # Control item: write what came before it first
+                write()
+                if item is None:
+                    return
+                # sync() marker
+                if self.connected:
+                    try:
+                        port.flush()
+                    except serial.SerialException as e:
+                        print(f"Sync failed: {e}")
+                        self._handle_disconnect(port)
+                item.set()
+
+            write()
+
+    def _write_buffer(self, port: serial.Serial, buf: bytearray):
+        """Write and clear the writer's batch buffer (dropped once disconnected)"""
+        if buf and self.connected:
+            try:
+                port.write(buf)
+            except serial.SerialException as e:
+                print(f"Send failed: {e}")
+                self._handle_disconnect(port)
+        del buf[:]
+
     def get_serial_port(self) -> Optional[serial.Serial]:
         """Get the raw serial port for direct access (used by OTA)"""
         return self.serial_port if self.connected else None
 
-    def _read_loop(self):
+    def _read_loop(self, port: serial.Serial, stop: threading.Event):
         """Background thread to read incoming data"""
-        while not self._stop_reader.is_set():
-            if not self.serial_port or not self.connected:
+        partial = b""
+        while not stop.is_set():
+            if not self.connected:
                 break
 
             try:
-                if self.serial_port.in_waiting > 0:
-                    line = self.serial_port.readline().decode('utf-8', errors='ignore').strip()
-                    if line and self.on_data_received:
-                        self.on_data_received(line)
-                else:
-                    time.sleep(0.01)  # Small delay to prevent CPU spinning
+                # Blocks until a full line arrives or disconnect() cancels the read
+                data = port.readline()
+                if stop.is_set():
+                    break
+                if not data:
+                    continue
+                if not data.endswith(b"\n"):
+                    # Read returned mid-line; keep the fragment for the next read
+                    partial += data
+                    continue
+
+                line = (partial + data).decode('utf-8', errors='ignore').strip()
+                partial = b""
+                if line and self.on_data_received:
+                    self.on_data_received(line)
 
             except serial.SerialException as e:
+                if stop.is_set():
+                    break
                 print(f"Read error: {e}")
-                self._handle_disconnect()
+                self._handle_disconnect(port)
                 break
             except Exception as e:
                 print(f"Unexpected read error: {e}")
                 time.sleep(0.1)
 
-    def _handle_disconnect(self):
-        """Handle unexpected disconnection"""
+    def _handle_disconnect(self, port: serial.Serial):
+        """Handle unexpected disconnection (ignored if port is no longer the current one)"""
+        if port is not self.serial_port or not self.connected:
+            return
         self.connected = False
         if self.on_connection_changed:
             self.on_connection_changed(False)
@@ -187,75 +347,114 @@ class BluetoothManager:
 
 
 class CommandProtocol:
-    """Helper class for building commands"""
+    """Helper class for building commands, pre-encoded with their trailing newline"""
 
     @staticmethod
-    def set_type(actuator_type: int) -> str:
-        return f"SET_TYPE:{actuator_type}"
+    def set_type(actuator_type: int) -> bytes:
+        return b"SET_TYPE:%d\n" % actuator_type
 
     @staticmethod
-    def set_extend(degrees: int) -> str:
-        return f"SET_EXTEND:{degrees}"
+    def set_extend(degrees: int) -> bytes:
+        return b"SET_EXTEND:%d\n" % degrees
 
     @staticmethod
-    def set_retract(degrees: int) -> str:
-        return f"SET_RETRACT:{degrees}"
+    def set_retract(degrees: int) -> bytes:
+        return b"SET_RETRACT:%d\n" % degrees
 
     @staticmethod
-    def set_dwell_extend(ms: int) -> str:
-        return f"SET_DWELL_EXT:{ms}"
+    def set_dwell_extend(ms: int) -> bytes:
+        return b"SET_DWELL_EXT:%d\n" % ms
 
     @staticmethod
-    def set_dwell_retract(ms: int) -> str:
-        return f"SET_DWELL_RET:{ms}"
+    def set_dwell_retract(ms: int) -> bytes:
+        return b"SET_DWELL_RET:%d\n" % ms
 
     @staticmethod
-    def set_speed(percent: int) -> str:
-        return f"SET_SPEED:{percent}"
+    def set_speed(percent: int) -> bytes:
+        return b"SET_SPEED:%d\n" % percent
 
     @staticmethod
-    def set_cycles(count: int) -> str:
-        return f"SET_CYCLES:{count}"
+    def set_cycles(count: int) -> bytes:
+        return b"SET_CYCLES:%d\n" % count
 
     @staticmethod
-    def start() -> str:
-        return "START"
+    def start() -> bytes:
+        return b"START\n"
 
     @staticmethod
-    def stop() -> str:
-        return "STOP"
+    def stop() -> bytes:
+        return b"STOP\n"
 
     @staticmethod
-    def pause() -> str:
-        return "PAUSE"
+    def pause() -> bytes:
+        return b"PAUSE\n"
 
     @staticmethod
-    def resume() -> str:
-        return "RESUME"
+    def resume() -> bytes:
+        return b"RESUME\n"
 
     @staticmethod
-    def go_home() -> str:
-        return "GO_HOME"
+    def go_home() -> bytes:
+        return b"GO_HOME\n"
 
     @staticmethod
-    def go_extend() -> str:
-        return "GO_EXTEND"
+    def go_extend() -> bytes:
+        return b"GO_EXTEND\n"
 
     @staticmethod
-    def go_retract() -> str:
-        return "GO_RETRACT"
+    def go_retract() -> bytes:
+        return b"GO_RETRACT\n"
 
     @staticmethod
-    def get_status() -> str:
-        return "STATUS"
+    def get_status() -> bytes:
+        return b"STATUS\n"
 
     @staticmethod
-    def get_settings() -> str:
-        return "GET_SETTINGS"
+    def get_settings() -> bytes:
+        return b"GET_SETTINGS\n"
 
     @staticmethod
-    def ping() -> str:
-        return "PING"
+    def ping() -> bytes:
+        return b"PING\n"
+
+
+def _item_size(item: tuple) -> int:
+    """Payload size of a writer queue item (0 for control items)"""
+    payload = item[2]
+    return len(payload) if isinstance(payload, bytes) else 0
+
+
+def encode_command(command: Union[str, bytes]) -> bytes:
+    """Encode a command as it is written to the serial port (bytes are already encoded)"""
+    if isinstance(command, bytes):
+        return command
+    return (command.strip() + "\n").encode('utf-8')
+
+
+def encode_commands(commands: List[Union[str, bytes]]) -> bytes:
+    """Encode a sequence of commands as one newline-delimited payload"""
+    return b"".join(encode_command(command) for command in commands)
+
+
+# Pre-encoded slider commands, indexed by degrees (0-90)
+EXTEND_COMMANDS = [CommandProtocol.set_extend(deg) for deg in range(91)]
+RETRACT_COMMANDS = [CommandProtocol.set_retract(deg) for deg in range(91)]
+
+# Pre-encoded dwell commands, indexed by tenths of a second (0.1-3.5 s)
+DWELL_EXTEND_COMMANDS = [CommandProtocol.set_dwell_extend(t * 100) for t in range(36)]
+DWELL_RETRACT_COMMANDS = [CommandProtocol.set_dwell_retract(t * 100) for t in range(36)]
+
+# Pre-encoded speed commands, indexed by percent (0-100)
+SPEED_COMMANDS = [CommandProtocol.set_speed(pct) for pct in range(101)]
+
+# Pre-encoded actuator type commands
+TYPE_COMMANDS = {t: CommandProtocol.set_type(t) for t in (6600, 6700)}
+
+
+# KEY=VALUE pairs in a response payload; the value runs to the next comma
+_PAIR_RE = re.compile(r"([^,=]*)=([^,]*)")
+# Values int() accepts: optional whitespace and sign, digits with single underscores
+_INT_RE = re.compile(r"\s*[-+]?\d+(?:_\d+)*\s*\Z")
 
 
 def parse_response(response: str) -> Tuple[str, dict]:
@@ -263,25 +462,15 @@ def parse_response(response: str) -> Tuple[str, dict]:
     Parse a response from the ESP32
     Returns (response_type, data_dict)
     """
-    if ":" not in response:
-        return (response, {})
-
-    parts = response.split(":", 1)
-    response_type = parts[0]
-
-    if len(parts) < 2 or not parts[1]:
+    response_type, sep, payload = response.partition(":")
+    if not sep or not payload:
         return (response_type, {})
 
-    data = {}
-    pairs = parts[1].split(",")
+    # OTA_PROGRESS carries a bare percentage rather than KEY=VALUE pairs
+    if response_type == "OTA_PROGRESS":
+        return (response_type, {"PCT": int(payload)} if _INT_RE.match(payload) else {})
 
-    for pair in pairs:
-        if "=" in pair:
-            key, value = pair.split("=", 1)
-            # Try to convert to int
-            try:
-                data[key] = int(value)
-            except ValueError:
-                data[key] = value
+    data = {key: int(value) if _INT_RE.match(value) else value
+            for key, value in _PAIR_RE.findall(payload)}
 
     return (response_type, data)
@@ -5,6 +5,8 @@ Handles persistent storage of application settings
 
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
 
 
@@ -21,6 +23,9 @@ class SettingsManager:
         "window_geometry": None,
     }
 
+    # Seconds to wait after a change before writing the file
+    SAVE_DELAY = 0.5
+
     def __init__(self, settings_file: str = None):
         if settings_file is None:
             # Store settings in user's app data folder
@@ -32,39 +37,89 @@ class SettingsManager:
             self.settings_file = Path(settings_file)
 
         self.settings = self.DEFAULT_SETTINGS.copy()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
         self.load()
 
     def load(self) -> dict:
         """Load settings from file"""
         try:
-            if self.settings_file.exists():
-                with open(self.settings_file, "r") as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to handle new settings
-                    self.settings = {**self.DEFAULT_SETTINGS, **loaded}
-        except (json.JSONDecodeError, IOError) as e:
+            # One read of the whole file, then parse from memory
+            with open(self.settings_file, "rb") as f:
+                data = f.read()
+            loaded = json.loads(data)
+            # Merge with defaults to handle new settings
+            self.settings = {**self.DEFAULT_SETTINGS, **loaded}
+        except FileNotFoundError:
+            pass
+        except (ValueError, IOError) as e:
             print(f"Error loading settings: {e}")
             self.settings = self.DEFAULT_SETTINGS.copy()
         return self.settings
 
     def save(self) -> bool:
-        """Save settings to file"""
+        """Save settings to file (atomically, via a temp file in the same folder)"""
+        with self._save_lock:
+            return self._write()
+
+    def _write(self) -> bool:
+        """Write a snapshot of the settings; the caller holds _save_lock"""
+        with self._lock:
+            snapshot = dict(self.settings)
+            self._dirty = False
+
+        tmp_path = None
         try:
-            with open(self.settings_file, "w") as f:
-                json.dump(self.settings, f, indent=2)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.settings_file.parent),
+                                            prefix=self.settings_file.name, suffix=".tmp")
+            data = json.dumps(snapshot, indent=2).encode("utf-8")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, str(self.settings_file))
             return True
-        except IOError as e:
+        except (IOError, OSError) as e:
             print(f"Error saving settings: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return False
 
+    def flush(self) -> bool:
+        """Write any pending changes immediately"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer:
+            timer.cancel()
+
+        # Taking _save_lock waits out a save already running on the timer thread
+        with self._save_lock:
+            with self._lock:
+                dirty = self._dirty
+            return self._write() if dirty else True
+
+    def _flush_pending(self):
+        """Timer callback for a deferred save"""
+        with self._lock:
+            self._save_timer = None
+            if not self._dirty:
+                return
+        self.save()
+
     def get(self, key: str, default=None):
         """Get a setting value"""
         return self.settings.get(key, default)
 
     def set(self, key: str, value) -> bool:
-        """Set a setting value and save"""
-        self.settings[key] = value
-        return self.save()
+        """Set a setting value; it is saved SAVE_DELAY seconds later, batched with other changes"""
+        with self._lock:
+            self.settings[key] = value
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self._flush_pending)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+        return True
 
     def get_all(self) -> dict:
         """Get all settings"""